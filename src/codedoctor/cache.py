@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess  # nosec B404
+import tarfile
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Any
+
+from codedoctor.runner import is_git_repo
+
+TOOL_CACHE_DIRS = (".mypy_cache", ".ruff_cache", ".pytest_cache")
+MANIFEST_NAME = "codedoctor-manifest.json"
+BUNDLE_SUFFIX = ".tar.gz"
+DEFAULT_IMPORT_DEPTH = 20
+CHUNK_SIZE = 1024 * 1024
+DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class CacheBundleResult:
+    bundle: Path | None
+    digest: str
+    files: int
+    commit: str | None = None
+    error: str | None = None
+
+
+class _HashingWriter:
+    def __init__(self, raw: IO[bytes]) -> None:
+        self.raw = raw
+        self.sha = hashlib.sha256()
+
+    def write(self, data: Any) -> int:
+        self.sha.update(data)
+        return self.raw.write(data)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+class _HashingReader:
+    def __init__(self, raw: IO[bytes]) -> None:
+        self.raw = raw
+        self.sha = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.sha.update(data)
+        return data
+
+
+def _sha256_file(path: Path) -> str:
+    sha = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _git_commits(repo_path: Path, depth: int) -> list[str]:
+    git = shutil.which("git")
+    if git is None or not is_git_repo(repo_path):
+        return []
+
+    proc = subprocess.run(  # nosec B603
+        [git, "rev-list", f"--max-count={max(1, depth)}", "HEAD"],
+        cwd=str(repo_path),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return []
+
+    return [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+
+
+def _report_root(report_dir: str) -> PurePosixPath | None:
+    root = PurePosixPath(report_dir.replace("\\", "/").strip("/"))
+    if (
+        not root.parts
+        or root.is_absolute()
+        or ".." in root.parts
+        or root.parts[0] in {".", ".git"}
+    ):
+        return None
+    return root
+
+
+def allowed_roots(report_dir: str) -> list[PurePosixPath]:
+    roots = [PurePosixPath(d) for d in TOOL_CACHE_DIRS]
+    report_root = _report_root(report_dir)
+    if report_root is not None:
+        roots.append(report_root)
+    return roots
+
+
+def _root_of(name: str, roots: list[PurePosixPath]) -> PurePosixPath | None:
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts:
+        return None
+    for root in roots:
+        if path != root and path.is_relative_to(root):
+            return root
+    return None
+
+
+def _has_symlink(repo_path: Path, rel: PurePosixPath) -> bool:
+    current = repo_path
+    for part in rel.parts:
+        current = current / part
+        if current.is_symlink():
+            return True
+    return False
+
+
+def collect_cache_files(repo_path: Path, report_dir: str) -> list[str]:
+    found: set[str] = set()
+
+    for root in allowed_roots(report_dir):
+        base = repo_path / root
+        if _has_symlink(repo_path, root) or not base.is_dir():
+            continue
+        for p in base.rglob("*"):
+            if p.is_file() and not p.is_symlink():
+                found.add(p.relative_to(repo_path).as_posix())
+
+    return sorted(found)
+
+
+def write_bundle(repo_path: Path, files: list[str], out: IO[bytes]) -> str:
+    writer = _HashingWriter(out)
+    manifest: dict[str, str] = {}
+
+    with gzip.GzipFile(filename="", fileobj=writer, mode="wb", mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tar:
+            for rel in files:
+                path = repo_path / rel
+                info = tarfile.TarInfo(name=rel)
+                info.size = path.stat().st_size
+                info.mode = 0o644
+                with path.open("rb") as f:
+                    reader = _HashingReader(f)
+                    tar.addfile(info, reader)  # type: ignore[arg-type]
+                manifest[rel] = reader.sha.hexdigest()
+
+            data = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode()
+            info = tarfile.TarInfo(name=MANIFEST_NAME)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+
+    return writer.sha.hexdigest()
+
+
+def export_cache(
+    repo_path: Path,
+    report_dir: str,
+    destination: Path,
+) -> CacheBundleResult:
+    files = collect_cache_files(repo_path=repo_path, report_dir=report_dir)
+    if not files:
+        return CacheBundleResult(
+            bundle=None, digest="", files=0, error="No cached results to export."
+        )
+
+    for root in allowed_roots(report_dir):
+        if destination.resolve().is_relative_to((repo_path / root).resolve()):
+            return CacheBundleResult(
+                bundle=None,
+                digest="",
+                files=0,
+                error=f"Destination must not be inside an exported directory: {root}",
+            )
+
+    to_file = destination.name.endswith(BUNDLE_SUFFIX)
+    target_dir = destination.parent if to_file else destination / "objects"
+    commits = _git_commits(repo_path, depth=1)
+    commit = commits[0] if commits else None
+    if commit is None and not to_file:
+        return CacheBundleResult(
+            bundle=None,
+            digest="",
+            files=0,
+            error="A cache store needs a git commit; export to a .tar.gz file instead.",
+        )
+
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target_dir, suffix=".partial")
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                digest = write_bundle(repo_path=repo_path, files=files, out=out)
+            target = destination if to_file else target_dir / f"{digest}{BUNDLE_SUFFIX}"
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        if commit is not None and not to_file:
+            ref = destination / "refs" / commit
+            ref.parent.mkdir(parents=True, exist_ok=True)
+            ref.write_text(digest + "\n", encoding="utf-8")
+    except OSError as e:
+        return CacheBundleResult(bundle=None, digest="", files=0, error=str(e))
+
+    return CacheBundleResult(
+        bundle=target, digest=digest, files=len(files), commit=commit
+    )
+
+
+def find_bundle(
+    repo_path: Path,
+    store: Path,
+    depth: int = DEFAULT_IMPORT_DEPTH,
+) -> tuple[Path, str | None] | None:
+    for commit in _git_commits(repo_path, depth=depth):
+        ref = store / "refs" / commit
+        if not ref.is_file():
+            continue
+        digest = ref.read_text(encoding="utf-8").strip()
+        if not DIGEST_RE.fullmatch(digest):
+            continue
+        candidate = store / "objects" / f"{digest}{BUNDLE_SUFFIX}"
+        if candidate.is_file():
+            return candidate, commit
+
+    return None
+
+
+def _parse_manifest(data: bytes) -> dict[str, str]:
+    manifest = json.loads(data.decode("utf-8"))
+    if not isinstance(manifest, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in manifest.items()
+    ):
+        raise ValueError("Bundle manifest is malformed.")
+    return manifest
+
+
+def _stage_bundle(
+    bundle: Path,
+    staging: Path,
+    roots: list[PurePosixPath],
+) -> dict[str, PurePosixPath]:
+    manifest: dict[str, str] | None = None
+    hashes: dict[str, str] = {}
+    members: dict[str, PurePosixPath] = {}
+
+    with tarfile.open(bundle, mode="r:gz") as tar:
+        for member in tar:
+            if member.name == MANIFEST_NAME:
+                f = tar.extractfile(member)
+                if f is None or manifest is not None:
+                    raise ValueError("Bundle manifest is unreadable.")
+                manifest = _parse_manifest(f.read())
+                continue
+
+            root = _root_of(member.name, roots)
+            if not member.isfile() or root is None or member.name in members:
+                raise ValueError(f"Unsafe bundle entry: {member.name}")
+
+            f = tar.extractfile(member)
+            if f is None:
+                raise ValueError(f"Unreadable bundle entry: {member.name}")
+            out = staging / member.name
+            out.parent.mkdir(parents=True, exist_ok=True)
+            with out.open("wb") as dst:
+                writer = _HashingWriter(dst)
+                shutil.copyfileobj(f, writer, CHUNK_SIZE)
+            hashes[member.name] = writer.sha.hexdigest()
+            members[member.name] = root
+
+    if manifest is None:
+        raise ValueError("Bundle is missing its manifest.")
+    if manifest != hashes:
+        raise ValueError("Bundle contents do not match its manifest.")
+
+    return members
+
+
+def restore_bundle(repo_path: Path, bundle: Path, report_dir: str) -> int:
+    roots = allowed_roots(report_dir)
+
+    with tempfile.TemporaryDirectory(dir=repo_path, prefix=".codedoctor-import-") as t:
+        staging = Path(t)
+        members = _stage_bundle(bundle=bundle, staging=staging, roots=roots)
+
+        used_roots = sorted(set(members.values()))
+        for root in used_roots:
+            if _has_symlink(repo_path, root):
+                raise ValueError(f"Refusing to restore into symlink: {root}")
+        for name, root in members.items():
+            if root.as_posix() in TOOL_CACHE_DIRS:
+                continue
+            if _has_symlink(repo_path, PurePosixPath(name)):
+                raise ValueError(f"Refusing to restore into symlink: {name}")
+
+        for root in used_roots:
+            dest = repo_path / root
+            if root.as_posix() in TOOL_CACHE_DIRS:
+                if dest.is_dir():
+                    shutil.rmtree(dest)
+                os.replace(staging / root, dest)
+                continue
+
+            for name, member_root in members.items():
+                if member_root == root:
+                    out = repo_path / name
+                    out.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(staging / name, out)
+
+    return len(members)
+
+
+def import_cache(
+    repo_path: Path,
+    source: Path,
+    report_dir: str,
+    depth: int = DEFAULT_IMPORT_DEPTH,
+) -> CacheBundleResult:
+    commit: str | None = None
+    if source.is_dir():
+        found = find_bundle(repo_path=repo_path, store=source, depth=depth)
+        if found is None:
+            return CacheBundleResult(
+                bundle=None,
+                digest="",
+                files=0,
+                error=f"No bundle in {source} for the last {depth} commits.",
+            )
+        source, commit = found
+
+    try:
+        digest = _sha256_file(source)
+    except OSError as e:
+        return CacheBundleResult(bundle=None, digest="", files=0, error=str(e))
+
+    expected = source.name.removesuffix(BUNDLE_SUFFIX)
+    if source.parent.name == "objects" and expected != digest:
+        return CacheBundleResult(
+            bundle=source,
+            digest=digest,
+            files=0,
+            commit=commit,
+            error=f"Bundle digest mismatch (expected {expected}).",
+        )
+
+    try:
+        files = restore_bundle(
+            repo_path=repo_path, bundle=source, report_dir=report_dir
+        )
+    except (
+        OSError,
+        ValueError,
+        EOFError,
+        tarfile.TarError,
+        json.JSONDecodeError,
+    ) as e:
+        return CacheBundleResult(
+            bundle=source, digest=digest, files=0, commit=commit, error=str(e)
+        )
+
+    return CacheBundleResult(bundle=source, digest=digest, files=files, commit=commit)
@@ -5,6 +5,12 @@ import time
 from dataclasses import replace
 from pathlib import Path
 
+from codedoctor.cache import (
+    DEFAULT_IMPORT_DEPTH,
+    CacheBundleResult,
+    export_cache,
+    import_cache,
+)
 from codedoctor.config import (
     CodeDoctorConfig,
     default_config_path,
@@ -29,6 +35,8 @@ def build_parser() -> argparse.ArgumentParser:
             "  codedoctor scan .\n"
             "  codedoctor scan . --fix\n"
             "  codedoctor update\n"
+            "  codedoctor cache export . --to ci-cache/\n"
+            "  codedoctor cache import . --from ci-cache/\n"
         ),
     )
     parser.add_argument(
@@ -55,6 +63,20 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable best-effort gitignore excludes for mypy/bandit.",
     )
+    scan.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="Skip the syntax pre-flight that gates mypy/bandit/pytest.",
+    )
+    scan.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Split ruff/bandit across N parallel shards (default: %(default)s).\n"
+            "Sharded ruff lints .py/.pyi/.ipynb files only."
+        ),
+    )
     scan.add_argument(
         "--report-dir",
         default=None,
@@ -71,6 +93,50 @@ def build_parser() -> argparse.ArgumentParser:
         help="Do not check PyPI for updates during scan.",
     )
 
+    cache = subs.add_parser("cache", help="Export or import cached scan results.")
+    cache_subs = cache.add_subparsers(dest="cache_command", required=True)
+
+    cache_export = cache_subs.add_parser(
+        "export", help="Pack reports and tool caches into a bundle."
+    )
+    cache_export.add_argument(
+        "path", nargs="?", default=".", help="Repo path (default: .)"
+    )
+    cache_export.add_argument(
+        "--to",
+        required=True,
+        help="Cache store directory, or a bundle file ending in .tar.gz.",
+    )
+    cache_export.add_argument(
+        "--report-dir",
+        default=None,
+        help="Directory (relative to repo) holding reports (overrides config).",
+    )
+
+    cache_import = cache_subs.add_parser(
+        "import", help="Restore reports and tool caches from a bundle."
+    )
+    cache_import.add_argument(
+        "path", nargs="?", default=".", help="Repo path (default: .)"
+    )
+    cache_import.add_argument(
+        "--from",
+        dest="source",
+        required=True,
+        help="Cache store directory, or a bundle file ending in .tar.gz.",
+    )
+    cache_import.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_IMPORT_DEPTH,
+        help="Commits to search back from HEAD in a store (default: %(default)s).",
+    )
+    cache_import.add_argument(
+        "--report-dir",
+        default=None,
+        help="Directory (relative to repo) holding reports (overrides config).",
+    )
+
     return parser
 
 
@@ -129,6 +195,43 @@ def maybe_print_update_notice(cfg: CodeDoctorConfig) -> CodeDoctorConfig:
     return cfg2
 
 
+def print_cache_result(action: str, res: CacheBundleResult) -> int:
+    if res.error:
+        print(f"Cache {action} failed: {res.error}")
+        return 1
+
+    print(f"Cache {action}ed {res.files} files ({res.digest[:12]}).")
+    print(f"Bundle: {res.bundle}")
+    if res.commit:
+        print(f"Commit: {res.commit}")
+    return 0
+
+
+def cmd_cache(args: argparse.Namespace, cfg: CodeDoctorConfig) -> int:
+    repo_path = Path(args.path).expanduser().resolve()
+
+    report_dir = args.report_dir if args.report_dir is not None else cfg.report_dir
+
+    if args.cache_command == "export":
+        res = export_cache(
+            repo_path=repo_path,
+            report_dir=report_dir,
+            destination=Path(args.to).expanduser().resolve(),
+        )
+        return print_cache_result("export", res)
+
+    if args.cache_command == "import":
+        res = import_cache(
+            repo_path=repo_path,
+            source=Path(args.source).expanduser().resolve(),
+            report_dir=report_dir,
+            depth=max(1, int(args.depth)),
+        )
+        return print_cache_result("import", res)
+
+    return 1
+
+
 def main(argv: list[str] | None = None) -> int:
     args = build_parser().parse_args(argv)
 
@@ -141,6 +244,9 @@ def main(argv: list[str] | None = None) -> int:
     if args.command == "update":
         return cmd_update(yes=bool(args.yes))
 
+    if args.command == "cache":
+        return cmd_cache(args=args, cfg=cfg)
+
     if args.command == "scan":
         if not cfg.setup_completed and not bool(args.assume_defaults):
             print("codedoctor is not set up yet.")
@@ -158,6 +264,7 @@ def main(argv: list[str] | None = None) -> int:
 
         apply_fixes = bool(args.fix) or cfg.apply_fixes
         skip_tests = bool(args.skip_tests) or cfg.skip_tests
+        preflight = (not bool(args.no_preflight)) and cfg.preflight
         respect_gitignore = (not bool(args.no_gitignore)) and cfg.respect_gitignore
 
         report_dir = args.report_dir if args.report_dir is not None else cfg.report_dir
@@ -168,6 +275,9 @@ def main(argv: list[str] | None = None) -> int:
             apply_fixes=apply_fixes,
             skip_tests=skip_tests,
             respect_gitignore=respect_gitignore,
+            jobs=max(1, int(args.jobs)),
+            cache_dir=report_root,
+            preflight=preflight,
         )
 
         paths = get_report_paths(repo_path=repo_path)
@@ -11,6 +11,7 @@ class CodeDoctorConfig:
     respect_gitignore: bool = True
     apply_fixes: bool = False
     skip_tests: bool = False
+    preflight: bool = True
     report_dir: str = ".codedoctor"
     setup_completed: bool = False
     last_update_check_unix: int = 0
@@ -37,6 +38,7 @@ def load_config(path: Path) -> CodeDoctorConfig:
         respect_gitignore=bool(data.get("respect_gitignore", True)),
         apply_fixes=bool(data.get("apply_fixes", False)),
         skip_tests=bool(data.get("skip_tests", False)),
+        preflight=bool(data.get("preflight", True)),
         report_dir=str(data.get("report_dir", ".codedoctor")),
         setup_completed=bool(data.get("setup_completed", False)),
         last_update_check_unix=int(data.get("last_update_check_unix", 0)),
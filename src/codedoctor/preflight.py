@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from codedoctor.report import CheckResult, CheckStatus
+
+PREFLIGHT_NAME = "syntax (pre-flight)"
+SYNTAX_CACHE_NAME = "syntax-cache.json"
+HEAVY_CHECK_PREFIXES = ("mypy", "bandit", "pytest")
+# ProcessPoolExecutor rejects more than 61 workers on Windows.
+MAX_POOL_WORKERS = 61
+# Below this many uncached files, starting worker processes costs more than it saves.
+POOL_MIN_FILES = 32
+
+
+def default_preflight_jobs() -> int:
+    return max(1, min(os.cpu_count() or 1, MAX_POOL_WORKERS))
+
+
+def _python_tag() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def compile_error(rel_path: str, source: bytes) -> str:
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            compile(source, rel_path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return f"{e.lineno or 0}:{e.offset or 0}: {e.msg}"
+    except (ValueError, RecursionError, MemoryError) as e:
+        return f"0:0: {type(e).__name__}: {e}"
+    return ""
+
+
+def _compile_error_job(job: tuple[str, bytes]) -> str:
+    return compile_error(*job)
+
+
+def load_syntax_cache(cache_dir: Path | None) -> dict[str, str]:
+    if cache_dir is None:
+        return {}
+
+    path = cache_dir / SYNTAX_CACHE_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("python") != _python_tag():
+        return {}
+    entries = data.get("entries")
+    if not isinstance(entries, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in entries.items()
+    ):
+        return {}
+    return entries
+
+
+def save_syntax_cache(cache_dir: Path | None, entries: dict[str, str]) -> None:
+    if cache_dir is None:
+        return
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / SYNTAX_CACHE_NAME).write_text(
+            json.dumps(
+                {"python": _python_tag(), "entries": entries},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+    except OSError:
+        return
+
+
+def run_syntax_preflight(
+    repo_path: Path,
+    files: list[str],
+    jobs: int | None = None,
+    cache_dir: Path | None = None,
+) -> CheckResult:
+    workers = default_preflight_jobs() if jobs is None else jobs
+    workers = max(1, min(workers, MAX_POOL_WORKERS))
+    cache = load_syntax_cache(cache_dir)
+    digests: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    pending: list[tuple[str, bytes]] = []
+
+    for rel in files:
+        try:
+            source = (repo_path / rel).read_bytes()
+        except OSError as e:
+            errors[rel] = f"0:0: {e.strerror or e}"
+            continue
+
+        digest = hashlib.sha256(source).hexdigest()
+        digests[rel] = digest
+        if digest in cache:
+            errors[rel] = cache[digest]
+        else:
+            pending.append((rel, source))
+
+    if workers > 1 and len(pending) > max(1, POOL_MIN_FILES):
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            chunksize = max(1, len(pending) // (workers * 4))
+            found = list(pool.map(_compile_error_job, pending, chunksize=chunksize))
+    else:
+        found = [_compile_error_job(job) for job in pending]
+
+    for (rel, _), err in zip(pending, found):
+        errors[rel] = err
+
+    save_syntax_cache(
+        cache_dir, {digests[rel]: errors[rel] for rel in files if rel in digests}
+    )
+
+    failures = [f"{rel}:{errors[rel]}" for rel in files if errors.get(rel)]
+    cached = len(digests) - len(pending)
+    summary = f"Checked {len(files)} files ({cached} cached)."
+
+    if failures:
+        output = "\n".join(
+            [
+                summary,
+                f"Syntax errors in {len(failures)} of them:",
+                *failures,
+            ]
+        )
+        returncode = 1
+    else:
+        output = summary
+        returncode = 0
+
+    return CheckResult(
+        name=PREFLIGHT_NAME,
+        command=[],
+        returncode=returncode,
+        output=output,
+        status=CheckStatus.FAIL if failures else CheckStatus.PASS,
+    )
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import json
+import os
 import re
 import shutil
 import subprocess  # nosec B404
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable
 
+from codedoctor.preflight import HEAVY_CHECK_PREFIXES, run_syntax_preflight
 from codedoctor.report import CheckResult, CheckStatus, ScanReport
 
+# Keep each tool invocation well under the Windows command-line limit (32K).
+MAX_ARGV_CHARS = 24_000
+RUFF_SUFFIXES = (".py", ".pyi", ".ipynb")
+BANDIT_SUFFIXES = (".py", ".pyw")
+
 
 def tool_exists(tool: str) -> bool:
     return shutil.which(tool) is not None
@@ -83,6 +94,94 @@ def to_bandit_exclude_csv(ignored_paths: Iterable[str]) -> str:
     return ",".join(out)
 
 
+def to_source_excludes(ignored_paths: Iterable[str]) -> list[str]:
+    bandit_excludes = to_bandit_exclude_csv(ignored_paths=ignored_paths).split(",")
+    return [e for e in bandit_excludes if e != "tests"]
+
+
+def _is_excluded(rel_path: str, excludes: Iterable[str]) -> bool:
+    parts = rel_path.split("/")
+    for ex in excludes:
+        if not ex:
+            continue
+        if "/" in ex:
+            if rel_path == ex or rel_path.startswith(ex + "/"):
+                return True
+        elif ex in parts:
+            return True
+    return False
+
+
+def list_git_files(repo_path: Path) -> list[str] | None:
+    git = shutil.which("git")
+    if git is None or not is_git_repo(repo_path):
+        return None
+
+    proc = subprocess.run(  # nosec B603
+        [git, "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+        cwd=str(repo_path),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None
+
+    return [p for p in proc.stdout.split("\0") if p]
+
+
+def discover_python_files(
+    repo_path: Path,
+    excludes: Iterable[str],
+    suffixes: tuple[str, ...] = (".py",),
+    use_git: bool = False,
+) -> list[str]:
+    excludes = [e.replace("\\", "/").strip("/") for e in excludes]
+
+    git_files = list_git_files(repo_path) if use_git else None
+    if git_files is not None:
+        return sorted(
+            {
+                rel
+                for rel in git_files
+                if rel.endswith(suffixes)
+                and not _is_excluded(rel, excludes)
+                and (repo_path / rel).is_file()
+            }
+        )
+
+    found: list[str] = []
+    for root, dirs, files in os.walk(repo_path):
+        rel_root = Path(root).relative_to(repo_path).as_posix()
+        rel_root = "" if rel_root == "." else rel_root + "/"
+
+        dirs[:] = sorted(d for d in dirs if not _is_excluded(rel_root + d, excludes))
+        for f in files:
+            rel = rel_root + f
+            if f.endswith(suffixes) and not _is_excluded(rel, excludes):
+                found.append(rel)
+
+    return sorted(found)
+
+
+def shard_files(repo_path: Path, files: Iterable[str], shards: int) -> list[list[str]]:
+    def size_of(rel: str) -> int:
+        try:
+            return (repo_path / rel).stat().st_size
+        except OSError:
+            return 0
+
+    sized = sorted(((size_of(f), f) for f in files), key=lambda t: (-t[0], t[1]))
+    buckets: list[list[str]] = [[] for _ in range(max(1, shards))]
+    loads = [0] * len(buckets)
+
+    for size, rel in sized:
+        idx = min(range(len(buckets)), key=lambda i: (loads[i], i))
+        buckets[idx].append(rel)
+        loads[idx] += size
+
+    return [sorted(b) for b in buckets if b]
+
+
 def classify_status(name: str, returncode: int, output: str) -> CheckStatus:
     if returncode != 0:
         return CheckStatus.FAIL
@@ -121,6 +220,202 @@ def run_command(display_name: str, cmd: list[str], cwd: Path) -> CheckResult:
     )
 
 
+def batch_files(files: list[str], max_chars: int = MAX_ARGV_CHARS) -> list[list[str]]:
+    batches: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+
+    for rel in files:
+        cost = len(rel) + 1
+        if current and size + cost > max_chars:
+            batches.append(current)
+            current, size = [], 0
+        current.append(rel)
+        size += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _load_json_reports(reports: list[str]) -> list[Any]:
+    loaded: list[Any] = []
+    for text in reports:
+        try:
+            loaded.append(json.loads(text))
+        except json.JSONDecodeError:
+            continue
+    return loaded
+
+
+def _relative_to(path: str, cwd: Path) -> str:
+    p = Path(path)
+    if p.is_absolute():
+        try:
+            return p.relative_to(cwd).as_posix()
+        except ValueError:
+            return p.as_posix()
+    return p.as_posix().removeprefix("./")
+
+
+def merge_ruff_reports(reports: list[str], cwd: Path, complete: bool = True) -> str:
+    findings: list[tuple[str, int, int, str]] = []
+    fixable = 0
+    unsafe = 0
+    for report in _load_json_reports(reports):
+        for item in report if isinstance(report, list) else []:
+            loc = item.get("location") or {}
+            code = item.get("code") or "error"
+            findings.append(
+                (
+                    _relative_to(str(item.get("filename", "")), cwd),
+                    int(loc.get("row", 0)),
+                    int(loc.get("column", 0)),
+                    f"{code} {item.get('message', '')}",
+                )
+            )
+            fix = item.get("fix") or {}
+            if fix.get("applicability") == "safe":
+                fixable += 1
+            elif fix.get("applicability") == "unsafe":
+                unsafe += 1
+
+    if not findings:
+        return "All checks passed!" if complete else ""
+
+    lines = [f"{path}:{row}:{col}: {text}" for path, row, col, text in sorted(findings)]
+    lines.append(f"Found {len(findings)} errors.")
+    if fixable:
+        lines.append(f"[*] {fixable} fixable with the `--fix` option.")
+    if unsafe:
+        lines.append(
+            f"{unsafe} hidden fixes can be enabled with the `--unsafe-fixes` option."
+        )
+    return "\n".join(lines)
+
+
+def merge_bandit_reports(reports: list[str], cwd: Path, complete: bool = True) -> str:
+    findings: list[tuple[str, int, str]] = []
+    severities = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    skipped: list[str] = []
+    loc = 0
+    for report in _load_json_reports(reports):
+        if not isinstance(report, dict):
+            continue
+        for item in report.get("results", []):
+            severity = str(item.get("issue_severity", "")).upper()
+            confidence = str(item.get("issue_confidence", "")).upper()
+            severities[severity] = severities.get(severity, 0) + 1
+            findings.append(
+                (
+                    _relative_to(str(item.get("filename", "")), cwd),
+                    int(item.get("line_number", 0)),
+                    f"[{item.get('test_id', '?')}:{severity}/{confidence}] "
+                    f"{item.get('issue_text', '')}",
+                )
+            )
+        for err in report.get("errors", []):
+            path = _relative_to(str(err.get("filename", "")), cwd)
+            skipped.append(f"  {path} ({err.get('reason', 'unknown')})")
+        totals = report.get("metrics", {}).get("_totals", {})
+        loc += int(totals.get("loc", 0))
+
+    lines = [f"{path}:{line}: {text}" for path, line, text in sorted(findings)]
+    if not findings and complete:
+        lines.append("No issues identified.")
+    lines.append(
+        f"Total issues: {len(findings)} (High: {severities['HIGH']}, "
+        f"Medium: {severities['MEDIUM']}, Low: {severities['LOW']})"
+    )
+    lines.append(f"Total lines of code: {loc}")
+    if skipped:
+        lines.append(f"Files skipped ({len(skipped)}):")
+        lines.extend(sorted(skipped))
+    return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class ShardPlan:
+    base_cmd: list[str]
+    output_flag: str
+    files: list[str]
+    merge: Callable[[list[str], Path, bool], str]
+
+
+def run_sharded_command(
+    display_name: str,
+    plan: ShardPlan,
+    cwd: Path,
+    jobs: int,
+) -> CheckResult:
+    shards = shard_files(repo_path=cwd, files=plan.files, shards=jobs)
+    batches = [batch for shard in shards for batch in batch_files(shard)]
+
+    with tempfile.TemporaryDirectory(prefix="codedoctor-shards-") as tmp:
+
+        def run_batch(index: int, batch: list[str]) -> tuple[CheckResult, str]:
+            out = Path(tmp) / f"batch-{index}.json"
+            cmd = plan.base_cmd + [plan.output_flag, str(out)] + batch
+            res = run_command(display_name=display_name, cmd=cmd, cwd=cwd)
+            try:
+                return res, out.read_text(encoding="utf-8")
+            except OSError:
+                return res, ""
+
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(batches)))) as pool:
+            parts = list(pool.map(run_batch, range(len(batches)), batches))
+
+    returncode = max((res.returncode for res, _ in parts), default=0)
+    failed = [res for res, report in parts if not report and res.returncode != 0]
+    output = plan.merge([report for _, report in parts], cwd, not failed)
+    tool_errors = [res.output for res, report in parts if not report and res.output]
+    if tool_errors:
+        output += "\n\nTool errors:\n" + "\n".join(tool_errors)
+    output = output.strip()
+
+    return CheckResult(
+        name=display_name,
+        command=plan.base_cmd
+        + [f"<{len(plan.files)} files in {len(shards)} shards, {len(batches)} runs>"],
+        returncode=returncode,
+        output=output,
+        status=classify_status(name=display_name, returncode=returncode, output=output),
+    )
+
+
+def build_shard_plans(
+    repo_path: Path,
+    respect_gitignore: bool,
+) -> dict[str, ShardPlan]:
+    ignored = get_gitignored_paths(repo_path) if respect_gitignore else []
+    bandit_excludes = to_bandit_exclude_csv(ignored_paths=ignored).split(",")
+
+    return {
+        "ruff (lint)": ShardPlan(
+            base_cmd=["ruff", "check", "--force-exclude", "--output-format", "json"],
+            output_flag="--output-file",
+            files=discover_python_files(
+                repo_path,
+                to_source_excludes(ignored),
+                RUFF_SUFFIXES,
+                use_git=respect_gitignore,
+            ),
+            merge=merge_ruff_reports,
+        ),
+        "bandit (security)": ShardPlan(
+            base_cmd=["bandit", "-q", "-f", "json"],
+            output_flag="-o",
+            files=discover_python_files(
+                repo_path,
+                bandit_excludes,
+                BANDIT_SUFFIXES,
+                use_git=respect_gitignore,
+            ),
+            merge=merge_bandit_reports,
+        ),
+    }
+
+
 def build_checks(
     repo_path: Path,
     apply_fixes: bool,
@@ -186,8 +481,30 @@ def scan_repo(
     apply_fixes: bool,
     skip_tests: bool,
     respect_gitignore: bool,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    preflight: bool = True,
+    preflight_jobs: int | None = None,
 ) -> ScanReport:
     results: list[CheckResult] = []
+    syntax: CheckResult | None = None
+    if preflight:
+        ignored = get_gitignored_paths(repo_path) if respect_gitignore else []
+        syntax = run_syntax_preflight(
+            repo_path=repo_path,
+            files=discover_python_files(
+                repo_path, to_source_excludes(ignored), use_git=respect_gitignore
+            ),
+            jobs=preflight_jobs,
+            cache_dir=cache_dir,
+        )
+        results.append(syntax)
+    skipped: list[str] = []
+    shard_plans = (
+        build_shard_plans(repo_path=repo_path, respect_gitignore=respect_gitignore)
+        if jobs > 1
+        else {}
+    )
 
     for name, cmd in build_checks(
         repo_path=repo_path,
@@ -195,6 +512,14 @@ def scan_repo(
         skip_tests=skip_tests,
         respect_gitignore=respect_gitignore,
     ):
+        if (
+            syntax is not None
+            and not syntax.ok
+            and name.startswith(HEAVY_CHECK_PREFIXES)
+        ):
+            skipped.append(name)
+            continue
+
         if not cmd:
             tool = name.split(" ", 1)[0]
             results.append(
@@ -211,6 +536,23 @@ def scan_repo(
             )
             continue
 
+        if name in shard_plans and shard_plans[name].files:
+            results.append(
+                run_sharded_command(
+                    display_name=name,
+                    plan=shard_plans[name],
+                    cwd=repo_path,
+                    jobs=jobs,
+                )
+            )
+            continue
+
         results.append(run_command(display_name=name, cmd=cmd, cwd=repo_path))
 
+    if syntax is not None and skipped:
+        results[0] = replace(
+            syntax,
+            output=syntax.output + "\n\nSkipped until fixed: " + ", ".join(skipped),
+        )
+
     return ScanReport(repo=str(repo_path), results=results)
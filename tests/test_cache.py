@@ -0,0 +1,182 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess  # nosec B404
+import tarfile
+
+import pytest
+
+from codedoctor.cache import MANIFEST_NAME, export_cache, import_cache
+
+
+def _write_bundle(path, members: dict[str, bytes]) -> None:
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _git(repo, *args: str) -> None:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "t",
+        "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t",
+        "GIT_COMMITTER_EMAIL": "t@example.com",
+    }
+    git = shutil.which("git")
+    assert git is not None  # nosec B101
+    subprocess.run(  # nosec B603
+        [git, *args], cwd=repo, env=env, check=True, capture_output=True
+    )
+
+
+def test_cache_bundle_round_trip(tmp_path) -> None:
+    src = tmp_path / "src"
+    (src / ".codedoctor").mkdir(parents=True)
+    (src / ".codedoctor" / "report-latest.txt").write_text("ok\n", encoding="utf-8")
+    (src / ".ruff_cache").mkdir()
+    (src / ".ruff_cache" / "data").write_bytes(b"cache")
+
+    bundle = tmp_path / "bundle.tar.gz"
+    exported = export_cache(src, ".codedoctor", bundle)
+    assert exported.error is None and exported.files == 2  # nosec B101
+    again = export_cache(src, ".codedoctor", tmp_path / "again.tar.gz")
+    assert again.digest == exported.digest  # nosec B101
+
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    imported = import_cache(dst, bundle, ".codedoctor")
+    assert imported.error is None  # nosec B101
+    assert (dst / ".ruff_cache" / "data").read_bytes() == b"cache"  # nosec B101
+
+
+def test_cache_import_rejects_unsafe_bundle(tmp_path) -> None:
+    bundle = tmp_path / "bundle.tar.gz"
+    _write_bundle(bundle, {"../evil.txt": b"x"})
+
+    res = import_cache(tmp_path, bundle, ".codedoctor")
+    assert res.error is not None  # nosec B101
+
+
+def test_cache_import_rejects_paths_outside_cache_dirs(tmp_path) -> None:
+    hook = b"#!/bin/sh\necho pwned\n"
+    members = {".git/hooks/post-checkout": hook, ".ruff_cache/data": b"ok"}
+    manifest = {
+        name: hashlib.sha256(data).hexdigest() for name, data in members.items()
+    }
+    bundle = tmp_path / "bundle.tar.gz"
+    _write_bundle(bundle, {**members, MANIFEST_NAME: json.dumps(manifest).encode()})
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    res = import_cache(repo, bundle, ".codedoctor")
+    assert res.error is not None and ".git/hooks" in res.error  # nosec B101
+    assert not (repo / ".git").exists()  # nosec B101
+    assert not (repo / ".ruff_cache").exists()  # nosec B101
+
+
+@pytest.mark.parametrize("manifest", [b"[]", b'{"a": 1}'])
+def test_cache_import_rejects_malformed_manifest(tmp_path, manifest) -> None:
+    bundle = tmp_path / "bundle.tar.gz"
+    _write_bundle(bundle, {MANIFEST_NAME: manifest})
+
+    res = import_cache(tmp_path, bundle, ".codedoctor")
+    assert res.error == "Bundle manifest is malformed."  # nosec B101
+
+
+def test_cache_import_refuses_symlinked_destination(tmp_path) -> None:
+    src = tmp_path / "src"
+    (src / ".ruff_cache").mkdir(parents=True)
+    (src / ".ruff_cache" / "data").write_bytes(b"cache")
+    bundle = tmp_path / "bundle.tar.gz"
+    export_cache(src, ".codedoctor", bundle)
+
+    repo = tmp_path / "repo"
+    outside = tmp_path / "outside"
+    repo.mkdir()
+    outside.mkdir()
+    (repo / ".ruff_cache").symlink_to(outside, target_is_directory=True)
+
+    res = import_cache(repo, bundle, ".codedoctor")
+    assert res.error is not None and "symlink" in res.error  # nosec B101
+    assert not (outside / "data").exists()  # nosec B101
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_cache_store_imports_nearest_commit(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    store = tmp_path / "store"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "first")
+    (repo / ".ruff_cache").mkdir()
+    (repo / ".ruff_cache" / "data").write_bytes(b"cache")
+
+    exported = export_cache(repo, ".codedoctor", store)
+    assert exported.error is None and exported.commit  # nosec B101
+    object_path = store / "objects" / f"{exported.digest}.tar.gz"
+    assert exported.bundle == object_path  # nosec B101
+    assert (store / "refs" / exported.commit).is_file()  # nosec B101
+
+    shutil.rmtree(repo / ".ruff_cache")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "second")
+
+    assert import_cache(repo, store, ".codedoctor", depth=1).error  # nosec B101
+    res = import_cache(repo, store, ".codedoctor", depth=2)
+    assert res.error is None and res.commit == exported.commit  # nosec B101
+    assert (repo / ".ruff_cache" / "data").read_bytes() == b"cache"  # nosec B101
+
+    assert exported.bundle is not None  # nosec B101
+    with exported.bundle.open("ab") as f:
+        f.write(b"tampered")
+    tampered = import_cache(repo, store, ".codedoctor", depth=2)
+    assert tampered.error is not None  # nosec B101
+    assert "digest mismatch" in tampered.error  # nosec B101
+
+
+def test_cache_store_export_requires_commit(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    (repo / ".ruff_cache").mkdir(parents=True)
+    (repo / ".ruff_cache" / "data").write_bytes(b"cache")
+
+    res = export_cache(repo, ".codedoctor", tmp_path / "store")
+    assert res.error is not None and "git commit" in res.error  # nosec B101
+    assert not (tmp_path / "store").exists()  # nosec B101
+
+
+def test_cache_export_refuses_destination_inside_exported_dir(tmp_path) -> None:
+    (tmp_path / ".codedoctor").mkdir()
+    (tmp_path / ".codedoctor" / "report-latest.txt").write_text(
+        "ok\n", encoding="utf-8"
+    )
+
+    for dest in (".codedoctor/store", ".codedoctor/bundle.tar.gz"):
+        res = export_cache(tmp_path, ".codedoctor", tmp_path / dest)
+        assert res.error is not None  # nosec B101
+    names = sorted(p.name for p in (tmp_path / ".codedoctor").iterdir())
+    assert names == ["report-latest.txt"]  # nosec B101
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_cache_store_ignores_invalid_ref(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    store = tmp_path / "store"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "first")
+    (repo / ".ruff_cache").mkdir()
+    (repo / ".ruff_cache" / "data").write_bytes(b"cache")
+    exported = export_cache(repo, ".codedoctor", store)
+    assert exported.bundle is not None and exported.commit  # nosec B101
+
+    shutil.copy(exported.bundle, store / "evil.tar.gz")
+    (store / "refs" / exported.commit).write_text("../evil\n", encoding="utf-8")
+    shutil.rmtree(repo / ".ruff_cache")
+
+    res = import_cache(repo, store, ".codedoctor")
+    assert res.error is not None  # nosec B101
+    assert not (repo / ".ruff_cache").exists()  # nosec B101
@@ -0,0 +1,140 @@
+import shutil
+import subprocess  # nosec B404
+import json
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from codedoctor import preflight as preflight_mod
+from codedoctor.preflight import (
+    MAX_POOL_WORKERS,
+    PREFLIGHT_NAME,
+    SYNTAX_CACHE_NAME,
+    compile_error,
+    default_preflight_jobs,
+    load_syntax_cache,
+    run_syntax_preflight,
+)
+from codedoctor.report import CheckStatus
+from codedoctor.runner import discover_python_files, scan_repo
+
+
+def _write_sources(repo) -> list[str]:
+    (repo / "ok.py").write_text("x = 1\n", encoding="utf-8")
+    (repo / "bad.py").write_text("def f(:\n", encoding="utf-8")
+    (repo / "worse.py").write_text("return 1\n", encoding="utf-8")
+    return ["bad.py", "ok.py", "worse.py"]
+
+
+def test_syntax_preflight_short_circuits_heavy_checks(tmp_path) -> None:
+    (tmp_path / "ok.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "bad.py").write_text("def f(:\n", encoding="utf-8")
+    cache_dir = tmp_path / ".codedoctor"
+
+    report = scan_repo(
+        repo_path=tmp_path,
+        apply_fixes=False,
+        skip_tests=False,
+        respect_gitignore=False,
+        cache_dir=cache_dir,
+    )
+
+    preflight = report.results[0]
+    assert preflight.name == PREFLIGHT_NAME  # nosec B101
+    assert preflight.status == CheckStatus.FAIL  # nosec B101
+    assert "bad.py:1:7:" in preflight.output  # nosec B101
+    heavy = [r.name for r in report.results if r.name.startswith(("mypy", "bandit"))]
+    assert not heavy  # nosec B101
+    assert (cache_dir / SYNTAX_CACHE_NAME).exists()  # nosec B101
+
+
+def test_syntax_preflight_pool_and_cache_agree(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(preflight_mod, "POOL_MIN_FILES", 0)
+    files = _write_sources(tmp_path)
+    cache_dir = tmp_path / ".codedoctor"
+
+    cold = run_syntax_preflight(tmp_path, files, jobs=2, cache_dir=cache_dir)
+    warm = run_syntax_preflight(tmp_path, files, jobs=2, cache_dir=cache_dir)
+
+    assert cold.output.startswith("Checked 3 files (0 cached).")  # nosec B101
+    assert warm.output.startswith("Checked 3 files (3 cached).")  # nosec B101
+    assert warm.status == CheckStatus.FAIL  # nosec B101
+    expected = [
+        "bad.py:1:7: invalid syntax",
+        "worse.py:1:1: 'return' outside function",
+    ]
+    for output in (cold.output, warm.output):
+        assert output.splitlines()[2:] == expected  # nosec B101
+
+
+def test_syntax_cache_is_invalidated_by_python_version(tmp_path, monkeypatch) -> None:
+    files = _write_sources(tmp_path)
+    cache_dir = tmp_path / ".codedoctor"
+    run_syntax_preflight(tmp_path, files, cache_dir=cache_dir)
+
+    monkeypatch.setattr(preflight_mod, "_python_tag", lambda: "0.0")
+    res = run_syntax_preflight(tmp_path, files, cache_dir=cache_dir)
+    assert res.output.startswith("Checked 3 files (0 cached).")  # nosec B101
+
+
+def test_compile_error_suppresses_syntax_warnings() -> None:
+    source = b'assert (1, "msg")\npattern = "\\d"\n'
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert compile_error("w.py", source) == ""  # nosec B101
+
+
+def test_scan_repo_without_preflight(tmp_path) -> None:
+    (tmp_path / "bad.py").write_text("def f(:\n", encoding="utf-8")
+
+    report = scan_repo(
+        repo_path=tmp_path,
+        apply_fixes=False,
+        skip_tests=True,
+        respect_gitignore=False,
+        preflight=False,
+    )
+    assert PREFLIGHT_NAME not in [r.name for r in report.results]  # nosec B101
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_discovery_skips_untracked_ignored_dirs(tmp_path) -> None:
+    git = shutil.which("git")
+    assert git is not None  # nosec B101
+    subprocess.run([git, "init", "-q"], cwd=tmp_path, check=True)  # nosec B603
+    (tmp_path / ".gitignore").write_text("env/\n", encoding="utf-8")
+    (tmp_path / "env").mkdir()
+    (tmp_path / "env" / "broken.py").write_text("def f(:\n", encoding="utf-8")
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+
+    assert discover_python_files(tmp_path, [], use_git=True) == ["app.py"]  # nosec B101
+    assert "env/broken.py" in discover_python_files(tmp_path, [])  # nosec B101
+
+
+def test_syntax_preflight_clamps_pool_size(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(preflight_mod, "POOL_MIN_FILES", 0)
+    sizes: list[int] = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, max_workers: int) -> None:
+            sizes.append(max_workers)
+            super().__init__(max_workers=min(max_workers, 2))
+
+    monkeypatch.setattr(preflight_mod, "ProcessPoolExecutor", RecordingPool)
+    files = [f"m{i}.py" for i in range(100)]
+    for name in files:
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+
+    res = run_syntax_preflight(tmp_path, files, jobs=1000)
+    assert res.status == CheckStatus.PASS  # nosec B101
+    assert sizes == [MAX_POOL_WORKERS]  # nosec B101
+    assert 1 <= default_preflight_jobs() <= MAX_POOL_WORKERS  # nosec B101
+
+
+@pytest.mark.parametrize("entries", [[], {"abc": None}, "x"])
+def test_load_syntax_cache_ignores_malformed_entries(tmp_path, entries) -> None:
+    data = {"python": preflight_mod._python_tag(), "entries": entries}
+    (tmp_path / SYNTAX_CACHE_NAME).write_text(json.dumps(data), encoding="utf-8")
+
+    assert load_syntax_cache(tmp_path) == {}  # nosec B101
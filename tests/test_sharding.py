@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+
+from codedoctor import runner
+from codedoctor.report import CheckResult, CheckStatus
+from codedoctor.runner import batch_files, discover_python_files, shard_files
+
+
+def test_discover_python_files_respects_excludes(tmp_path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_a.py").write_text("", encoding="utf-8")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "site.py").write_text("", encoding="utf-8")
+
+    files = discover_python_files(tmp_path, [".venv", "tests"])
+    assert files == ["pkg/a.py"]  # nosec B101
+
+
+def test_shard_files_balances_by_size(tmp_path) -> None:
+    sizes = {"a.py": 100, "b.py": 60, "c.py": 50, "d.py": 10}
+    for name, size in sizes.items():
+        (tmp_path / name).write_text("#" * size, encoding="utf-8")
+
+    shards = shard_files(tmp_path, sizes, shards=2)
+    assert shards == [["a.py", "d.py"], ["b.py", "c.py"]]  # nosec B101
+    assert shard_files(tmp_path, sizes, shards=2) == shards  # nosec B101
+
+
+def test_batch_files_caps_argv_size() -> None:
+    files = [f"pkg/module_{i:04d}.py" for i in range(100)]
+    batches = batch_files(files, max_chars=200)
+    assert len(batches) > 1  # nosec B101
+    assert [f for b in batches for f in b] == files  # nosec B101
+    assert all(sum(len(f) + 1 for f in b) <= 200 for b in batches)  # nosec B101
+
+
+def test_run_sharded_command_merges_findings(tmp_path, monkeypatch) -> None:
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+
+    def fake_run_command(display_name, cmd, cwd) -> CheckResult:
+        out = Path(cmd[cmd.index("--output-file") + 1])
+        files = [c for c in cmd if c.endswith(".py")]
+        items = [
+            {
+                "filename": str(cwd / f),
+                "location": {"row": 1, "column": 1},
+                "code": "F401",
+                "message": "unused",
+                "fix": None,
+            }
+            for f in files
+            if f != "b.py"
+        ]
+        out.write_text(json.dumps(items), encoding="utf-8")
+        rc = 1 if items else 0
+        return CheckResult(display_name, cmd, rc, "", CheckStatus.PASS)
+
+    monkeypatch.setattr(runner, "run_command", fake_run_command)
+    plan = runner.ShardPlan(
+        base_cmd=["ruff", "check"],
+        output_flag="--output-file",
+        files=["a.py", "b.py", "c.py"],
+        merge=runner.merge_ruff_reports,
+    )
+
+    res = runner.run_sharded_command("ruff (lint)", plan, tmp_path, jobs=3)
+    assert res.returncode == 1  # nosec B101
+    assert res.status == CheckStatus.FAIL  # nosec B101
+    assert res.output.splitlines() == [  # nosec B101
+        "a.py:1:1: F401 unused",
+        "c.py:1:1: F401 unused",
+        "Found 2 errors.",
+    ]
+
+
+def test_scan_repo_shards_only_ruff_and_bandit(tmp_path, monkeypatch) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+    commands: dict[str, list[str]] = {}
+
+    def fake_run_command(display_name, cmd, cwd) -> CheckResult:
+        commands.setdefault(display_name, cmd)
+        return CheckResult(display_name, cmd, 0, "", CheckStatus.PASS)
+
+    monkeypatch.setattr(runner, "tool_exists", lambda tool: True)
+    monkeypatch.setattr(runner, "run_command", fake_run_command)
+    report = runner.scan_repo(
+        repo_path=tmp_path,
+        apply_fixes=False,
+        skip_tests=False,
+        respect_gitignore=False,
+        jobs=2,
+    )
+
+    by_name = {r.name: r for r in report.results}
+    assert "--output-file" in commands["ruff (lint)"]  # nosec B101
+    assert "-o" in commands["bandit (security)"]  # nosec B101
+    assert by_name["ruff (lint)"].command[-1].startswith("<1 files")  # nosec B101
+    assert by_name["mypy (types)"].command[:2] == ["mypy", "."]  # nosec B101
+    assert by_name["pytest (tests)"].command == ["pytest", "-q"]  # nosec B101
+
+
+def test_merge_ruff_reports_counts_only_safe_fixes(tmp_path) -> None:
+    def item(row: int, applicability: str | None) -> dict:
+        fix = {"applicability": applicability} if applicability else None
+        return {
+            "filename": str(tmp_path / "a.py"),
+            "location": {"row": row, "column": 1},
+            "code": "F401",
+            "message": "unused",
+            "fix": fix,
+        }
+
+    report = [item(1, "safe"), item(2, "unsafe"), item(3, "displayonly")]
+    report.append(item(4, None))
+    lines = runner.merge_ruff_reports([json.dumps(report)], tmp_path).splitlines()
+
+    assert lines[-3:] == [  # nosec B101
+        "Found 4 errors.",
+        "[*] 1 fixable with the `--fix` option.",
+        "1 hidden fixes can be enabled with the `--unsafe-fixes` option.",
+    ]
+
+
+def test_run_sharded_command_without_report_is_not_success(
+    tmp_path, monkeypatch
+) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+
+    def fake_run_command(display_name, cmd, cwd) -> CheckResult:
+        return CheckResult(display_name, cmd, 2, "bad config", CheckStatus.FAIL)
+
+    monkeypatch.setattr(runner, "run_command", fake_run_command)
+    plan = runner.ShardPlan(
+        base_cmd=["ruff", "check"],
+        output_flag="--output-file",
+        files=["a.py"],
+        merge=runner.merge_ruff_reports,
+    )
+
+    res = runner.run_sharded_command("ruff (lint)", plan, tmp_path, jobs=2)
+    assert res.status == CheckStatus.FAIL  # nosec B101
+    assert "All checks passed!" not in res.output  # nosec B101
+    assert res.output == "Tool errors:\nbad config"  # nosec B101